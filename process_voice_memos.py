@@ -1,31 +1,214 @@
 #!/usr/bin/env python3
-"""Process voice memos: convert to MP3 and transcribe."""
+"""Process voice memos: decode and transcribe."""
+import argparse
+import logging
+import math
+import threading
 import time
-from src.file_utils import find_audio_files, read_timestamp, write_timestamp, write_string_to_file
-from src.audio_converter import convert_to_mp3
-from src.transcriber import transcribe_mp3
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+from src.file_utils import find_audio_files_with_ctime, read_timestamp, write_timestamp, write_string_to_file
+from src.decode_pool import DecodePool
+from src.transcriber import transcribe_many, unload_models, warm_up
 import os
 
-def generate_timestamp():
-    return str(int(time.time()))
+log = logging.getLogger("voice_memos")
+
+# Number of files decoded ahead of the one being transcribed. Each is held in memory
+# as float32 samples (about 230 MB per hour of audio), so keep this small.
+DECODE_AHEAD = 2
+
+# Number of decodes running at once
+DECODE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Formats decoded in-process by PyAV; others are decoded by an ffmpeg subprocess
+NATIVE_EXTENSIONS = {'.m4a'}
+
+# Watch mode: keep the Whisper model in memory between memos (set KEEP_LOADED=0 to release it)
+KEEP_LOADED = os.getenv("KEEP_LOADED", "1") != "0"
+
+# Seconds to wait after a change in the memos directory before processing it
+SETTLE_SECONDS = 5
+
+def load_audio(audio_file: Path, pool: DecodePool) -> Future:
+    """Queue a decode of audio_file to 16 kHz samples, in-process if PyAV can read it."""
+    if audio_file.suffix.lower() in NATIVE_EXTENSIONS:
+        return pool.decode_native(audio_file)
+    return pool.decode(audio_file)
+
+def decode_ahead(
+    audio_files: Iterable[Path],
+    ahead: int = DECODE_AHEAD,
+    workers: int = DECODE_WORKERS
+) -> Iterator[Future]:
+    """
+    Decode audio files to 16 kHz float32 samples on a DecodePool.
+
+    Files in NATIVE_EXTENSIONS are decoded in-process by PyAV; anything else (e.g.
+    QuickTime .qta) goes through ffmpeg, with up to `workers` decodes running at
+    once. At most `ahead` files are decoded ahead of the consumer, so decoding
+    overlaps with transcription of the previous file without holding every memo
+    in memory.
+
+    Yields:
+        Future: Decoded samples for each input file, in input order. Call result() to
+                get them; a file that fails to decode raises there without stopping
+                the others.
+    """
+    pending = deque()
+    with DecodePool(size=workers) as pool:
+        try:
+            for audio_file in audio_files:
+                pending.append(load_audio(audio_file, pool))
+                if len(pending) > ahead:
+                    yield pending.popleft()
+
+            while pending:
+                yield pending.popleft()
+        finally:
+            # Consumer stopped early: drop decodes nobody will transcribe
+            for future in pending:
+                future.cancel()
+
+def process_once(voice_memos_dir: Union[str, Path], output_dir: Union[str, Path]) -> None:
+    """Transcribe every memo created since the last run into output_dir."""
+    timestamp = read_timestamp("last_timestamp.txt")
+    found = find_audio_files_with_ctime(voice_memos_dir, timestamp)
+    if not found:
+        return
+
+    # Files are sorted newest first. Resuming from its ctime (not "now") keeps memos
+    # recorded while this run was busy for the next run.
+    newest_ctime = found[0][0]
+    audio_files = [path for _, path in found]
+
+    # One timestamp per run plus an index, so memos finished within the same second don't collide
+    base_timestamp = int(time.time())
+
+    # Memos that decoded, in the order transcribe_many returns their transcriptions,
+    # and the ctimes of those that didn't
+    decoded_files = deque()
+    failed_ctimes = []
+
+    def decoded_samples():
+        for (ctime, audio_file), decoded in zip(found, decode_ahead(audio_files)):
+            try:
+                samples = decoded.result()
+            except Exception:
+                # Don't let one unreadable memo hold back the rest of this run
+                log.exception("Failed to decode %s, skipping it", audio_file.name)
+                failed_ctimes.append(ctime)
+                continue
+
+            decoded_files.append(audio_file)
+            yield samples
+
+    # Writes to iCloud Drive are slow; do them on a background thread so the
+    # next transcription starts immediately
+    writes = []
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        # Short memos are batched together into shared forward passes
+        for i, transcription in enumerate(transcribe_many(decoded_samples())):
+            audio_file = decoded_files.popleft()
+            log.info("Processed %s", audio_file.name)
+            writes.append(writer.submit(
+                write_string_to_file, output_dir, f"{base_timestamp}_{i:03d}.md", transcription
+            ))
+
+    # Only advance the timestamp once every transcript is safely written
+    for write in writes:
+        write.result()
+
+    resume_ctime = newest_ctime
+    if failed_ctimes:
+        # Stop just short of the oldest memo that failed so the next run retries it.
+        # Memos newer than it are transcribed again then; a duplicate note beats a lost one.
+        resume_ctime = math.nextafter(min(failed_ctimes), -math.inf)
+
+    write_timestamp("last_timestamp.txt", resume_ctime)
+
+def watch(
+    voice_memos_dir: Union[str, Path],
+    output_dir: Union[str, Path],
+    keep_loaded: bool = KEEP_LOADED
+) -> None:
+    """
+    Keep running and transcribe new memos as they appear in voice_memos_dir.
+
+    The Whisper model stays loaded between events, so its load and warm-up cost is
+    paid once per daemon instead of once per memo. With keep_loaded=False the model
+    is released after every batch to free memory while idle.
+    """
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    changed = threading.Event()
+
+    class _ChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if not event.is_directory:
+                changed.set()
+
+    if keep_loaded:
+        # Pay model load and first-inference setup before the first memo arrives
+        warm_up()
+
+    observer = Observer()
+    observer.schedule(_ChangeHandler(), str(voice_memos_dir), recursive=False)
+    observer.start()
+    try:
+        # Catch up on anything recorded while we weren't running
+        changed.set()
+        while True:
+            changed.wait()
+            # Let Voice Memos finish writing before picking the file up
+            time.sleep(SETTLE_SECONDS)
+            changed.clear()
+
+            try:
+                process_once(voice_memos_dir, output_dir)
+            except Exception:
+                # Stay up (e.g. the model download failed or the output folder is
+                # briefly unavailable). The timestamp wasn't advanced, so the next
+                # change in the memos directory retries these memos.
+                log.exception("Failed to process voice memos")
+
+            if not keep_loaded:
+                unload_models()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
 
 def main():
     home_directory_env = os.getenv("HOME")
     """Main processing function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and transcribe new memos as they are recorded")
+    args = parser.parse_args()
+
+    # Progress goes to stderr; WHISPER_LOG_LEVEL=WARNING silences it. Unknown level
+    # names fall back to INFO rather than failing at startup.
+    level_name = os.getenv("WHISPER_LOG_LEVEL", "INFO").upper()
+    logging.basicConfig(
+        level=logging.getLevelNamesMapping().get(level_name, logging.INFO),
+        format="%(asctime)s %(message)s",
+    )
+    # faster-whisper logs VAD and language detection details at INFO for every file
+    logging.getLogger("faster_whisper").setLevel(logging.WARNING)
+
     # Use accessible directory for voice memos
     voice_memos_dir = f"{home_directory_env}/Library/Group Containers/group.com.apple.VoiceMemos.shared/Recordings"
     output_dir = f"{home_directory_env}/Library/Mobile Documents/iCloud~md~obsidian/Documents/Personal/01_Audio inbox"
 
-    timestamp = read_timestamp("last_timestamp.txt")
-    audio_files = find_audio_files(voice_memos_dir, timestamp)
-
-    for audio_file in audio_files:
-        print(f"Processing {audio_file.name}")
-        convert_to_mp3(audio_file, "temp.mp3")
-        transcription = transcribe_mp3("temp.mp3")
-        write_string_to_file(output_dir, generate_timestamp() + ".md", transcription)
-
-    write_timestamp("last_timestamp.txt")
+    if args.watch:
+        watch(voice_memos_dir, output_dir)
+    else:
+        process_once(voice_memos_dir, output_dir)
 
 
 if __name__ == "__main__":
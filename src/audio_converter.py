@@ -1,9 +1,10 @@
-"""Audio file conversion module using pydub."""
+"""Audio file conversion module using ffmpeg."""
 
+import subprocess
 from pathlib import Path
 from typing import Union
 
-from pydub import AudioSegment
+import numpy as np
 
 
 
@@ -35,19 +36,61 @@ def convert_to_mp3(input_path: Union[str, Path], output_path: Union[str, Path])
         except OSError as e:
             raise ValueError(f"Cannot create output directory: {output_dir}") from e
     
-    # Load audio file (pydub auto-detects format from extension)
+    # Transcode in a single ffmpeg process (input format is auto-detected)
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error", "-y",
+        "-i", str(input_path),
+        "-vn", "-c:a", "libmp3lame", "-q:a", "4",
+        str(output_path),
+    ]
     try:
-        audio = AudioSegment.from_file(str(input_path))
-    except Exception as e:
-        raise Exception(f"Failed to load audio file: {e}") from e
-    
-    # Export as MP3
-    try:
-        audio.export(str(output_path), format="mp3")
-    except Exception as e:
-        raise Exception(f"Failed to export as MP3: {e}") from e
+        subprocess.run(cmd, capture_output=True, check=True)
+    except OSError as e:
+        raise Exception(f"Failed to run ffmpeg: {e}") from e
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode(errors="replace").strip()
+        raise Exception(f"Failed to convert to MP3: {stderr}") from e
 
 
+def decode_to_array(input_path: Union[str, Path], sr: int = 16000) -> np.ndarray:
+    """
+    Decode any audio file to mono float32 PCM in memory.
+    
+    ffmpeg writes raw samples to a pipe, so nothing is encoded or written to disk.
+    The result can be passed straight to the transcriber.
+    
+    Args:
+        input_path: Path to the input audio file (any format ffmpeg can read)
+        sr: Target sample rate in Hz (Whisper expects 16000)
+        
+    Returns:
+        np.ndarray: 1-D float32 array of samples in [-1, 1]
+        
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        Exception: If decoding fails
+    """
+    input_path = Path(input_path)
+    
+    # Validate input file exists
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", str(input_path),
+        "-f", "f32le", "-ar", str(sr), "-ac", "1",
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, check=True)
+    except OSError as e:
+        raise Exception(f"Failed to run ffmpeg: {e}") from e
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode(errors="replace").strip()
+        raise Exception(f"Failed to decode audio file: {stderr}") from e
+    
+    return np.frombuffer(proc.stdout, dtype=np.float32)
 
 
 
@@ -0,0 +1,66 @@
+"""Bounded worker pool for decoding audio files off the caller's thread."""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+from faster_whisper import decode_audio
+
+from src.audio_converter import decode_to_array
+
+
+class DecodePool:
+    """
+    Decode audio files to float32 samples on a fixed number of worker threads.
+
+    Each worker runs one decode at a time, either an ffmpeg subprocess (decode) or
+    faster-whisper's in-process PyAV decoder (decode_native), so no more than `size`
+    decodes run at once no matter how many files are queued. This keeps a batch of
+    memos from oversubscribing the CPU, and lets the caller keep other work (such as
+    transcription) going while decodes finish in the background.
+
+    Usage:
+        with DecodePool() as pool:
+            futures = [pool.decode(path) for path in paths]
+            for future in futures:
+                samples = future.result()
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        """
+        Args:
+            size: Maximum number of concurrent decodes. Defaults to os.cpu_count().
+        """
+        self.size = size or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="decode")
+
+    def decode(self, input_path: Union[str, Path], sr: int = 16000) -> Future:
+        """
+        Queue an ffmpeg decode of input_path to float32 samples (see decode_to_array).
+
+        Returns:
+            Future: Resolves to the decoded np.ndarray, or raises the decoding error
+        """
+        return self._executor.submit(decode_to_array, input_path, sr)
+
+    def decode_native(self, input_path: Union[str, Path], sr: int = 16000) -> Future:
+        """
+        Queue an in-process decode of input_path with faster-whisper's PyAV decoder.
+
+        Skips the ffmpeg subprocess and its pipe for formats PyAV reads directly.
+
+        Returns:
+            Future: Resolves to the decoded np.ndarray, or raises the decoding error
+        """
+        return self._executor.submit(decode_audio, str(input_path), sampling_rate=sr)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        """Stop accepting jobs and optionally wait for the queued ones to finish."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def __enter__(self) -> "DecodePool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown(wait=True, cancel_futures=exc_type is not None)
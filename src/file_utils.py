@@ -3,7 +3,10 @@
 import os
 import time
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
+
+# Extensions to search for (matched against the lower-cased file name)
+AUDIO_EXTENSIONS = ('.m4a', '.qta')
 
 
 def find_audio_files(
@@ -19,7 +22,33 @@ def find_audio_files(
                   If None, return all M4A and QTA files.
         
     Returns:
-        List[Path]: List of Path objects for M4A and QTA files found
+        List[Path]: List of Path objects for M4A and QTA files found, newest first
+        
+    Raises:
+        FileNotFoundError: If the directory doesn't exist
+        NotADirectoryError: If the path is not a directory
+        PermissionError: If access to the directory is denied by the system
+    """
+    return [path for _, path in find_audio_files_with_ctime(directory, timestamp)]
+
+
+def find_audio_files_with_ctime(
+    directory: Union[str, Path],
+    timestamp: Optional[float] = None
+) -> List[Tuple[float, Path]]:
+    """
+    Like find_audio_files, but also return the creation time read for each file.
+    
+    Callers that need a file's ctime (e.g. to resume from the newest one) can use
+    it from here instead of stat'ing the file a second time, when it might already
+    have been moved or deleted.
+    
+    Args:
+        directory: Path to the directory to search
+        timestamp: Optional Unix timestamp. If provided, only return files created after this time.
+        
+    Returns:
+        List[Tuple[float, Path]]: (ctime, path) pairs for M4A and QTA files found, newest first
         
     Raises:
         FileNotFoundError: If the directory doesn't exist
@@ -36,14 +65,27 @@ def find_audio_files(
     if not directory.is_dir():
         raise NotADirectoryError(f"Path is not a directory: {directory}")
     
-    # Extensions to search for (case-insensitive)
-    audio_extensions = {'.m4a', '.qta'}
-    
     found_files = []
     
-    # Iterate through all files in directory
+    # Stream the directory once; DirEntry caches stat results, so each file is stat'ed
+    # once, and only matching files are ever turned into Path objects
     try:
-        items = list(directory.iterdir())
+        with os.scandir(directory) as it:
+            audio_entries = (
+                entry for entry in it
+                if entry.name.lower().endswith(AUDIO_EXTENSIONS) and entry.is_file()
+            )
+            for entry in audio_entries:
+                try:
+                    # Get file creation time (or modification time as fallback)
+                    file_ctime = entry.stat().st_ctime
+                except OSError:
+                    # Skip files we can't access
+                    continue
+                
+                # If timestamp is provided, only include files created after it
+                if timestamp is None or file_ctime > timestamp:
+                    found_files.append((file_ctime, Path(entry.path)))
     except PermissionError as e:
         # Provide helpful error message for permission issues
         error_msg = (
@@ -70,31 +112,9 @@ def find_audio_files(
         
         raise PermissionError(error_msg) from e
     
-    for item in items:
-        # Skip if not a file
-        if not item.is_file():
-            continue
-        
-        # Check if file has one of the target extensions (case-insensitive)
-        if item.suffix.lower() in audio_extensions:
-            # If timestamp is provided, check creation time
-            if timestamp is not None:
-                try:
-                    # Get file creation time (or modification time as fallback)
-                    file_ctime = os.path.getctime(item)
-                    
-                    # Only include if file was created after the timestamp
-                    if file_ctime > timestamp:
-                        found_files.append(item)
-                except OSError:
-                    # Skip files we can't access
-                    continue
-            else:
-                # No timestamp filter, include all matching files
-                found_files.append(item)
-    
-    # Sort by creation time (newest first)
-    found_files.sort(key=lambda f: os.path.getctime(f), reverse=True)
+    # Sort by the ctime captured above (newest first); keying on it alone avoids
+    # comparing paths when two files share a ctime
+    found_files.sort(key=lambda pair: pair[0], reverse=True)
     
     return found_files
 
@@ -124,7 +144,7 @@ def read_timestamp(filepath: Union[str, Path]) -> Optional[float]:
 
 def write_timestamp(filepath: Union[str, Path], timestamp: Optional[float] = None) -> None:
     """
-    Write current timestamp to a file.
+    Write a timestamp (the current time by default) to a file.
     
     Args:
         filepath: Path to the timestamp file
@@ -1,17 +1,155 @@
-import whisper
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
-whisper_model = whisper.load_model("large")
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.vad import VadOptions, collect_chunks, get_speech_timestamps
 
-def transcribe_mp3(mp3_path: Union[str, Path], model: str = "large") -> str:
+# Model tier, device and CTranslate2 weight quantization, overridable from the environment
+DEFAULT_MODEL = os.getenv("WHISPER_MODEL", "base.en")
+DEFAULT_DEVICE = os.getenv("WHISPER_DEVICE")
+DEFAULT_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE")
+
+# Number of audio chunks decoded per forward pass by transcribe_long / transcribe_many
+DEFAULT_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+
+# Whisper works on 16 kHz mono audio in windows of at most 30 seconds
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 30
+
+# Silero VAD settings: only speech reaches the decoder, pauses of 0.5 s or more are cut out
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+# Audio can be given as a file path or as 16 kHz mono float32 samples
+AudioInput = Union[str, Path, np.ndarray]
+
+
+def _select_device() -> Tuple[str, str]:
+    """
+    Pick the inference device and matching compute type.
+
+    CUDA GPUs run in float16; everything else runs int8 on the CPU (which on
+    Apple Silicon goes through CTranslate2's Accelerate backend).
+
+    Returns:
+        Tuple[str, str]: (device, compute_type)
+    """
+    device = DEFAULT_DEVICE
+    if device is None:
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+    compute_type = DEFAULT_COMPUTE_TYPE
+    if compute_type is None:
+        compute_type = "float16" if device == "cuda" else "int8"
+
+    return device, compute_type
+
+
+@lru_cache(maxsize=None)
+def _load_model(name: str) -> WhisperModel:
+    """
+    Load a Whisper model once per process and keep it cached.
+
+    Args:
+        name: faster-whisper model name (e.g. "tiny", "base.en", "small.en", "large-v3")
+
+    Returns:
+        WhisperModel: The loaded model
+    """
+    device, compute_type = _select_device()
+    return WhisperModel(name, device=device, compute_type=compute_type)
+
+
+@lru_cache(maxsize=None)
+def _load_pipeline(name: str) -> BatchedInferencePipeline:
+    """
+    Wrap a cached Whisper model in a batched inference pipeline.
+
+    Args:
+        name: faster-whisper model name
+
+    Returns:
+        BatchedInferencePipeline: Pipeline sharing the model returned by _load_model
+    """
+    return BatchedInferencePipeline(model=_load_model(name))
+
+
+def warm_up(model: Optional[str] = None, iterations: int = 2) -> None:
+    """
+    Load a model and run it on a second of silence so later calls start fast.
+
+    CTranslate2 already uses fused kernels and a preallocated decoder cache, so
+    there is nothing to compile; the first real transcription still pays for
+    weight loading, CUDA context creation and allocator growth, which this moves
+    to startup.
+
+    Args:
+        model: Whisper model to warm up. Defaults to WHISPER_MODEL, or "base.en".
+        iterations: Number of warm-up passes
+    """
+    whisper_model = _load_model(model or DEFAULT_MODEL)
+    silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+    for _ in range(iterations):
+        # VAD would drop the silence entirely, so bypass it to exercise the model
+        segments, _ = whisper_model.transcribe(silence, beam_size=1, vad_filter=False)
+        for _ in segments:
+            pass
+
+
+def unload_models() -> None:
+    """Drop every cached model and pipeline so their memory can be reclaimed."""
+    _load_pipeline.cache_clear()
+    _load_model.cache_clear()
+
+
+def _resolve_audio(audio: AudioInput) -> Union[str, np.ndarray]:
+    """
+    Validate an audio input and normalize it for faster-whisper.
+
+    Args:
+        audio: Path to an audio file, or an already decoded sample array
+
+    Returns:
+        Union[str, np.ndarray]: The path as a string, or the array unchanged
+
+    Raises:
+        FileNotFoundError: If the audio file doesn't exist
     """
-    Transcribe an MP3 file to text using OpenAI Whisper.
+    if isinstance(audio, np.ndarray):
+        return audio
+
+    audio_path = Path(audio)
+
+    # Validate input file exists
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    return str(audio_path)
+
+
+def transcribe_mp3(
+    mp3_path: AudioInput,
+    model: Optional[str] = None,
+    vad_filter: bool = True
+) -> str:
+    """
+    Transcribe an MP3 file to text using faster-whisper (CTranslate2).
+
+    Silence is removed with Silero VAD before decoding, so leading/trailing
+    silence and long pauses cost no decoder time and cannot be hallucinated over.
 
     Args:
-        mp3_path: Path to the MP3 file to transcribe
-        model: Whisper model to use. Options: "tiny", "base", "small", "medium", "large"
-               Default is "base" which provides a good balance of speed and accuracy.
+        mp3_path: Path to the MP3 (or any other ffmpeg-readable) file to transcribe,
+                  or 16 kHz mono float32 samples such as from decode_to_array
+        model: Whisper model to use, e.g. "tiny", "base.en", "small.en", "large-v3".
+               Defaults to the WHISPER_MODEL environment variable, or "base.en".
+               The model is loaded on first use and reused by later calls.
+        vad_filter: Drop non-speech with Silero VAD before decoding. Disable to run
+                    every window through the model (e.g. for music or test tones).
 
     Returns:
         str: Transcribed text from the audio file
@@ -20,17 +158,219 @@ def transcribe_mp3(mp3_path: Union[str, Path], model: str = "large") -> str:
         FileNotFoundError: If the MP3 file doesn't exist
         Exception: If transcription fails
     """
-    mp3_path = Path(mp3_path)
+    audio = _resolve_audio(mp3_path)
 
-    # Validate input file exists
-    if not mp3_path.exists():
-        raise FileNotFoundError(f"MP3 file not found: {mp3_path}")
+    try:
+        whisper_model = _load_model(model or DEFAULT_MODEL)
+
+        # Transcribe the audio file (segments are decoded lazily while iterating)
+        segments, _ = whisper_model.transcribe(
+            audio, beam_size=1, vad_filter=vad_filter, vad_parameters=VAD_PARAMETERS
+        )
+
+        return "".join(segment.text for segment in segments)
+    except Exception as e:
+        raise Exception(f"Failed to transcribe audio: {e}") from e
+
+
+def transcribe_long(
+    audio_path: AudioInput,
+    model: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    vad_filter: bool = True
+) -> str:
+    """
+    Transcribe a long recording by decoding its 30-second chunks in parallel.
+
+    Paths are decoded once into a 16 kHz float32 array, cut at speech pauses
+    into chunks of at most CHUNK_SECONDS, and up to batch_size chunks are run
+    through the model together instead of one window after another.
+
+    Args:
+        audio_path: Path to the audio file to transcribe, or 16 kHz mono float32 samples
+        model: Whisper model to use. Defaults to WHISPER_MODEL, or "base.en".
+        batch_size: Number of chunks decoded per forward pass
+        vad_filter: Cut chunks at speech detected by Silero VAD and drop the rest.
+                    When disabled, the audio is split into fixed CHUNK_SECONDS windows.
+
+    Returns:
+        str: Transcribed text from the audio file
+
+    Raises:
+        FileNotFoundError: If the audio file doesn't exist
+        Exception: If transcription fails
+    """
+    audio = _resolve_audio(audio_path)
 
     try:
+        if isinstance(audio, str):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        clip_timestamps = None
+        if not vad_filter:
+            # Without VAD the pipeline has nowhere to cut audio longer than one
+            # window, so hand it fixed CHUNK_SECONDS windows (in seconds)
+            duration = len(audio) / SAMPLE_RATE
+            clip_timestamps = [
+                {"start": start, "end": min(start + CHUNK_SECONDS, duration)}
+                for start in range(0, int(np.ceil(duration)), CHUNK_SECONDS)
+            ]
 
-        # Transcribe the audio file
-        result = whisper_model.transcribe(str(mp3_path))
+        pipeline = _load_pipeline(model or DEFAULT_MODEL)
+        segments, _ = pipeline.transcribe(
+            audio,
+            batch_size=batch_size,
+            chunk_length=CHUNK_SECONDS,
+            beam_size=1,
+            vad_filter=vad_filter,
+            vad_parameters=VAD_PARAMETERS,
+            clip_timestamps=clip_timestamps,
+        )
 
-        return result["text"]
+        return "".join(segment.text for segment in segments)
     except Exception as e:
-        raise Exception(f"Failed to transcribe audio: {e}") from e
\ No newline at end of file
+        raise Exception(f"Failed to transcribe audio: {e}") from e
+
+
+def _split_chunks(audio: np.ndarray, vad_filter: bool) -> List[np.ndarray]:
+    """
+    Cut one recording into pieces of at most CHUNK_SECONDS for batched decoding.
+
+    With vad_filter, only speech is kept and pauses are cut out (as the batched
+    pipeline does in transcribe_long); otherwise the audio is split into fixed windows.
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        vad_filter: Keep only speech detected by Silero VAD
+
+    Returns:
+        List[np.ndarray]: The chunks in order; empty if there is nothing to transcribe
+    """
+    if not vad_filter:
+        window = CHUNK_SECONDS * SAMPLE_RATE
+        return [audio[start:start + window] for start in range(0, len(audio), window)]
+
+    vad_options = VadOptions(**VAD_PARAMETERS, max_speech_duration_s=CHUNK_SECONDS)
+    speech = get_speech_timestamps(audio, vad_options)
+    if not speech:
+        return []
+
+    chunks, _ = collect_chunks(audio, speech, max_duration=CHUNK_SECONDS)
+    return chunks
+
+
+def _transcribe_chunks(
+    file_chunks: List[List[np.ndarray]],
+    model: Optional[str],
+    batch_size: int
+) -> List[str]:
+    """
+    Run the chunks of several files through one batched pipeline call.
+
+    The chunks are laid end to end, each padded to a whole second, and passed as
+    one clip_timestamps entry apiece. faster-whisper tags every segment with its
+    chunk's offset in frames (segment.seek), which maps it back to its file.
+
+    Args:
+        file_chunks: Chunks of each file, as returned by _split_chunks
+        model: Whisper model to use. Defaults to WHISPER_MODEL, or "base.en".
+        batch_size: Number of chunks decoded per forward pass
+
+    Returns:
+        List[str]: Transcribed text for each file, in input order
+
+    Raises:
+        Exception: If transcription fails
+    """
+    texts = [""] * len(file_chunks)
+
+    pieces = []
+    clips = []
+    owners = []
+    offset = 0
+    for index, chunks in enumerate(file_chunks):
+        for chunk in chunks:
+            padded = int(np.ceil(len(chunk) / SAMPLE_RATE)) * SAMPLE_RATE
+            pieces.append(np.pad(chunk, (0, padded - len(chunk))))
+            clips.append({"start": offset // SAMPLE_RATE, "end": (offset + len(chunk)) / SAMPLE_RATE})
+            owners.append(index)
+            offset += padded
+
+    if not clips:
+        return texts
+
+    try:
+        pipeline = _load_pipeline(model or DEFAULT_MODEL)
+        # The clips already hold only what should be transcribed, so VAD stays off
+        segments, _ = pipeline.transcribe(
+            np.concatenate(pieces),
+            batch_size=batch_size,
+            chunk_length=CHUNK_SECONDS,
+            beam_size=1,
+            vad_filter=False,
+            clip_timestamps=clips,
+        )
+
+        # Chunks start on whole seconds, so their frame offsets are exact
+        frames_per_second = pipeline.model.frames_per_second
+        owner_by_seek = {
+            clip["start"] * frames_per_second: owner for clip, owner in zip(clips, owners)
+        }
+        for segment in segments:
+            texts[owner_by_seek[segment.seek]] += segment.text
+    except Exception as e:
+        raise Exception(f"Failed to transcribe audio: {e}") from e
+
+    return texts
+
+
+def transcribe_many(
+    mp3_paths: Iterable[AudioInput],
+    model: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    vad_filter: bool = True
+) -> Iterator[str]:
+    """
+    Transcribe several audio files, batching chunks from different files together.
+
+    Each file is decoded and cut into chunks of at most CHUNK_SECONDS (speech only,
+    unless vad_filter is False). Files are collected until they add up to
+    batch_size chunks, and that group goes through the batched pipeline in one
+    call, so a run of short memos shares forward passes instead of paying one each.
+
+    Args:
+        mp3_paths: Paths to the audio files (or decoded sample arrays) to transcribe.
+                   May be a lazy iterable; items are read one group ahead of the
+                   transcriptions yielded.
+        model: Whisper model to use. Defaults to WHISPER_MODEL, or "base.en".
+        batch_size: Number of chunks decoded per forward pass
+        vad_filter: Drop non-speech with Silero VAD (see transcribe_long)
+
+    Yields:
+        str: Transcribed text for each file, in input order
+
+    Raises:
+        FileNotFoundError: If one of the files doesn't exist
+        Exception: If transcription fails
+    """
+    group = []
+    group_size = 0
+    for mp3_path in mp3_paths:
+        audio = _resolve_audio(mp3_path)
+
+        try:
+            if isinstance(audio, str):
+                audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+            chunks = _split_chunks(audio, vad_filter)
+        except Exception as e:
+            raise Exception(f"Failed to transcribe audio: {e}") from e
+
+        group.append(chunks)
+        group_size += len(chunks)
+        if group_size >= batch_size:
+            yield from _transcribe_chunks(group, model, batch_size)
+            group = []
+            group_size = 0
+
+    if group:
+        yield from _transcribe_chunks(group, model, batch_size)
@@ -0,0 +1,104 @@
+"""Shared pytest fixtures."""
+
+import os
+import wave
+
+import numpy as np
+import pytest
+
+# Tests only check the return type, so run Whisper with int8 weights on any device
+os.environ.setdefault("WHISPER_COMPUTE_TYPE", "int8")
+
+# Whisper pads every input to a 30 s window, so a short tone exercises the same
+# model path as a long one while keeping encode/decode and STFT work minimal
+TONE_MS = 100
+
+# Test audio is generated directly at Whisper's input rate
+SAMPLE_RATE = 16000
+
+
+def pytest_configure(config):
+    """Keep downloaded Whisper weights in .pytest_cache so reruns skip the download.
+
+    faster-whisper fetches models through huggingface_hub, which reads HF_HUB_CACHE
+    when it is first imported (during test collection, after this hook). Only the
+    hub cache is redirected, so a token stored under HF_HOME keeps working.
+    """
+    cache_dir = config.rootpath / ".pytest_cache" / "whisper_models"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("HF_HUB_CACHE", str(cache_dir))
+
+
+@pytest.fixture(scope="session")
+def whisper_models():
+    """Load each Whisper model used by the tests once per session.
+
+    Loading goes through the transcriber's lru_cache, so later transcribe_mp3
+    calls with the same model name reuse these instances.
+    """
+    from src.transcriber import _load_model
+    
+    return {"tiny": _load_model("tiny")}
+
+
+def _tone(frequency, duration_ms, square=False):
+    """Generate a mono float32 tone at SAMPLE_RATE (a square wave if square=True)."""
+    t = np.arange(SAMPLE_RATE * duration_ms // 1000, dtype=np.float32) / SAMPLE_RATE
+    signal = np.sin(2 * np.pi * frequency * t)
+    if square:
+        signal = np.sign(signal)
+    return (0.1 * signal).astype(np.float32)
+
+
+def _write_wav(path, samples):
+    """Write float samples in [-1, 1] as a 16-bit mono PCM WAV file."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(pcm.tobytes())
+
+
+@pytest.fixture(scope="session")
+def short_tone_wav(tmp_path_factory):
+    """A short 440 Hz tone, written as an uncompressed WAV once per session."""
+    wav_file = tmp_path_factory.mktemp("audio") / "tone.wav"
+    _write_wav(wav_file, _tone(440, TONE_MS))
+    return wav_file
+
+
+@pytest.fixture(scope="session")
+def long_tone_wav(tmp_path_factory):
+    """A sine/square/sine sequence of three short tones, written as a WAV once per session."""
+    tone1 = _tone(440, TONE_MS)
+    tone2 = _tone(880, TONE_MS, square=True)
+    
+    wav_file = tmp_path_factory.mktemp("audio") / "long_tone.wav"
+    _write_wav(wav_file, np.concatenate([tone1, tone2, tone1]))
+    return wav_file
+
+
+@pytest.fixture(scope="session")
+def long_tone_array():
+    """65 seconds of 440 Hz as samples: three 30 second chunks, no file or encoder needed."""
+    return _tone(440, 65000)
+
+
+@pytest.fixture
+def fake_audio(monkeypatch):
+    """Skip audio decoding: every file decodes to a one second 440 Hz tone.
+
+    Only the decode stage is replaced; transcribe_mp3's file-existence check still runs.
+    Silero VAD finds no speech in a tone, so tests using this fixture pass
+    vad_filter=False to make the samples actually reach the model.
+    """
+    samples = _tone(440, 1000)
+    
+    def decode_audio(input_file, sampling_rate=16000, split_stereo=False):
+        return samples
+    
+    # faster-whisper decodes paths inside WhisperModel.transcribe; transcribe_long decodes itself
+    monkeypatch.setattr("faster_whisper.transcribe.decode_audio", decode_audio)
+    monkeypatch.setattr("src.transcriber.decode_audio", decode_audio)
+    return samples
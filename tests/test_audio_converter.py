@@ -3,9 +3,12 @@
 import tempfile
 import os
 from pathlib import Path
+import numpy as np
 import pytest
+from pydub import AudioSegment
+from pydub.generators import Sine
 
-from src.audio_converter import convert_to_mp3
+from src.audio_converter import convert_to_mp3, decode_to_array
 
 
 class TestConvertToMP3:
@@ -15,9 +18,6 @@ class TestConvertToMP3:
         """Test converting a WAV file to MP3."""
         with tempfile.TemporaryDirectory() as tmpdir:
             # Create a simple WAV file using pydub
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             # Generate a 1-second sine wave
             tone = Sine(440).to_audio_segment(duration=1000)  # 1 second at 440Hz
             
@@ -40,9 +40,6 @@ class TestConvertToMP3:
     def test_convert_flac_to_mp3(self):
         """Test converting a FLAC file to MP3."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             tone = Sine(440).to_audio_segment(duration=1000)
             
             input_file = Path(tmpdir) / "test_input.flac"
@@ -59,9 +56,6 @@ class TestConvertToMP3:
     def test_convert_m4a_to_mp3(self):
         """Test converting an M4A file to MP3."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             tone = Sine(440).to_audio_segment(duration=1000)
             
             input_file = Path(tmpdir) / "test_input.m4a"
@@ -82,9 +76,6 @@ class TestConvertToMP3:
     def test_convert_qta_to_m4a_available(self):
         """Test if conversion from QTA (QuickTime Audio) to M4A format is available."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             tone = Sine(440).to_audio_segment(duration=1000)
             
             # QTA files typically use .mov or .qt extension
@@ -123,9 +114,6 @@ class TestConvertToMP3:
     def test_creates_output_directory(self):
         """Test that output directory is created if it doesn't exist."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             tone = Sine(440).to_audio_segment(duration=1000)
             
             input_file = Path(tmpdir) / "test_input.wav"
@@ -145,9 +133,6 @@ class TestConvertToMP3:
     def test_string_paths_accepted(self):
         """Test that function accepts string paths in addition to Path objects."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             tone = Sine(440).to_audio_segment(duration=1000)
             
             input_file = os.path.join(tmpdir, "test_input.wav")
@@ -162,9 +147,6 @@ class TestConvertToMP3:
     def test_output_file_overwrites_existing(self):
         """Test that existing output file is overwritten."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            from pydub import AudioSegment
-            from pydub.generators import Sine
-            
             tone1 = Sine(440).to_audio_segment(duration=1000)
             tone2 = Sine(880).to_audio_segment(duration=2000)  # Different frequency and duration
             
@@ -187,3 +169,53 @@ class TestConvertToMP3:
             
             # Durations should be different, confirming overwrite
             assert first_duration != second_duration
+
+
+class TestDecodeToArray:
+    """Test cases for decode_to_array function."""
+    
+    def test_decode_wav_to_array(self):
+        """Test decoding a WAV file to 16 kHz mono float32 samples."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # 1 second stereo tone at 44.1 kHz, 6 dB below full scale since
+            # ffmpeg's mono downmix of identical channels gains 3 dB
+            tone = Sine(440).to_audio_segment(duration=1000, volume=-6.0).set_channels(2)
+            
+            input_file = Path(tmpdir) / "test_input.wav"
+            tone.export(str(input_file), format="wav")
+            
+            samples = decode_to_array(input_file)
+            
+            assert samples.dtype == np.float32
+            assert samples.ndim == 1
+            assert abs(len(samples) - 16000) < 160
+            assert np.abs(samples).max() <= 1.0
+    
+    def test_custom_sample_rate(self):
+        """Test that the sample rate argument is honoured."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tone = Sine(440).to_audio_segment(duration=1000)
+            
+            input_file = os.path.join(tmpdir, "test_input.wav")
+            tone.export(input_file, format="wav")
+            
+            samples = decode_to_array(input_file, sr=8000)
+            
+            assert abs(len(samples) - 8000) < 80
+    
+    def test_file_not_found_error(self):
+        """Test that FileNotFoundError is raised for non-existent input file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_file = Path(tmpdir) / "nonexistent.wav"
+            
+            with pytest.raises(FileNotFoundError):
+                decode_to_array(input_file)
+    
+    def test_invalid_audio_error(self):
+        """Test that ffmpeg's error message is surfaced for unreadable input."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_file = Path(tmpdir) / "not_audio.wav"
+            input_file.write_text("this is not audio")
+            
+            with pytest.raises(Exception, match="Failed to decode audio file: .+"):
+                decode_to_array(input_file)
@@ -0,0 +1,74 @@
+"""Unit tests for the decode worker pool."""
+
+import tempfile
+from pathlib import Path
+import numpy as np
+import pytest
+from pydub.generators import Sine
+
+from src.decode_pool import DecodePool
+
+
+class TestDecodePool:
+    """Test cases for DecodePool."""
+    
+    def test_default_size(self):
+        """Test that the pool defaults to at least one worker."""
+        with DecodePool() as pool:
+            assert pool.size >= 1
+    
+    def test_decode_returns_samples(self):
+        """Test decoding a file through the pool."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tone = Sine(440).to_audio_segment(duration=1000)
+            
+            input_file = Path(tmpdir) / "input.wav"
+            tone.export(str(input_file), format="wav")
+            
+            with DecodePool(size=1) as pool:
+                samples = pool.decode(input_file).result()
+            
+            assert samples.dtype == np.float32
+            assert len(samples) > 0
+    
+    def test_decode_many_files(self):
+        """Test decoding several files concurrently."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tone = Sine(440).to_audio_segment(duration=1000)
+            
+            input_files = []
+            for i in range(4):
+                input_file = Path(tmpdir) / f"input{i}.wav"
+                tone.export(str(input_file), format="wav")
+                input_files.append(input_file)
+            
+            with DecodePool(size=2) as pool:
+                futures = [pool.decode(input_file) for input_file in input_files]
+                results = [future.result() for future in futures]
+            
+            assert all(abs(len(samples) - 16000) < 160 for samples in results)
+    
+    def test_decode_native_returns_samples(self):
+        """Test decoding a file in-process through the pool."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tone = Sine(440).to_audio_segment(duration=1000)
+            
+            input_file = Path(tmpdir) / "input.wav"
+            tone.export(str(input_file), format="wav")
+            
+            with DecodePool(size=1) as pool:
+                samples = pool.decode_native(input_file).result()
+            
+            assert samples.dtype == np.float32
+            assert abs(len(samples) - 16000) < 160
+    
+    def test_errors_surface_through_future(self):
+        """Test that decoding errors are raised from the future."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_file = Path(tmpdir) / "nonexistent.wav"
+            
+            with DecodePool(size=1) as pool:
+                future = pool.decode(input_file)
+                
+                with pytest.raises(FileNotFoundError):
+                    future.result()
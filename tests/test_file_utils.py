@@ -6,7 +6,7 @@ import os
 from pathlib import Path
 import pytest
 
-from src.file_utils import find_audio_files
+from src.file_utils import find_audio_files, find_audio_files_with_ctime
 
 
 class TestFindAudioFiles:
@@ -159,6 +159,41 @@ class TestFindAudioFiles:
             assert result[0].name == "third.m4a"
             assert result[2].name == "first.m4a"
     
+    def test_each_file_stat_once(self, monkeypatch):
+        """Test that sorting reuses the ctime read during filtering."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            
+            for i in range(5):
+                (tmpdir_path / f"audio{i}.m4a").touch()
+            
+            # Any extra per-file getctime call would be a redundant stat
+            def fail_getctime(path):
+                raise AssertionError(f"unexpected getctime({path})")
+            
+            monkeypatch.setattr(os.path, "getctime", fail_getctime)
+            
+            result = find_audio_files(tmpdir_path, timestamp=0)
+            
+            assert len(result) == 5
+    
+    def test_with_ctime_returns_pairs(self):
+        """Test that each file comes with the ctime it was filtered and sorted by."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            
+            file1 = tmpdir_path / "audio1.m4a"
+            file1.touch()
+            time.sleep(0.01)
+            file2 = tmpdir_path / "audio2.qta"
+            file2.touch()
+            
+            result = find_audio_files_with_ctime(tmpdir_path)
+            
+            assert [path for _, path in result] == [file2, file1]
+            assert result[0][0] == os.path.getctime(file2)
+            assert result[1][0] == os.path.getctime(file1)
+    
     def test_no_subdirectories_searched(self):
         """Test that subdirectories are not searched (non-recursive)."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,176 @@
+"""Unit tests for the voice memo processing pipeline."""
+
+import os
+import time
+from concurrent.futures import Future
+from pathlib import Path
+import pytest
+
+import process_voice_memos
+from process_voice_memos import decode_ahead, process_once
+from src.file_utils import find_audio_files, read_timestamp
+
+BASE_TIMESTAMP = 1700000000
+
+
+def _completed(result=None, exception=None):
+    """A Future that has already finished with result or exception."""
+    future = Future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+def _fake_transcribe_many(samples):
+    """Stand-in for transcribe_many: one transcription per decoded item, in order."""
+    for item in samples:
+        yield f"text of {item}"
+
+
+@pytest.fixture
+def memos(tmp_path, monkeypatch):
+    """Three memos, oldest first, with decoding and transcription stubbed out.
+    
+    Runs from tmp_path so last_timestamp.txt is written there.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(process_voice_memos.time, "time", lambda: BASE_TIMESTAMP)
+    monkeypatch.setattr(
+        process_voice_memos, "load_audio", lambda audio_file, pool: _completed(audio_file.name)
+    )
+    monkeypatch.setattr(process_voice_memos, "transcribe_many", _fake_transcribe_many)
+    
+    memos_dir = tmp_path / "memos"
+    memos_dir.mkdir()
+    
+    memo_files = []
+    for name in ("old.m4a", "middle.qta", "new.m4a"):
+        memo_file = memos_dir / name
+        memo_file.touch()
+        memo_files.append(memo_file)
+        time.sleep(0.01)
+    
+    return memos_dir, memo_files
+
+
+class TestProcessOnce:
+    """Test cases for process_once function."""
+    
+    def test_no_files_returns_early(self, tmp_path, monkeypatch):
+        """Test that an empty memos directory writes nothing."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "memos").mkdir()
+        
+        process_once(tmp_path / "memos", tmp_path / "out")
+        
+        assert not (tmp_path / "out").exists()
+        assert not (tmp_path / "last_timestamp.txt").exists()
+    
+    def test_transcripts_named_by_run_and_index(self, memos, tmp_path):
+        """Test that transcripts are written as {base}_{index:03d}.md, newest memo first."""
+        memos_dir, _ = memos
+        
+        process_once(memos_dir, tmp_path / "out")
+        
+        written = sorted(path.name for path in (tmp_path / "out").iterdir())
+        assert written == [f"{BASE_TIMESTAMP}_{i:03d}.md" for i in range(3)]
+        assert (tmp_path / "out" / f"{BASE_TIMESTAMP}_000.md").read_text() == "text of new.m4a"
+        assert (tmp_path / "out" / f"{BASE_TIMESTAMP}_002.md").read_text() == "text of old.m4a"
+    
+    def test_saves_newest_ctime(self, memos, tmp_path):
+        """Test that the next run resumes from the newest memo's ctime."""
+        memos_dir, memo_files = memos
+        
+        process_once(memos_dir, tmp_path / "out")
+        
+        assert read_timestamp("last_timestamp.txt") == os.path.getctime(memo_files[-1])
+        assert find_audio_files(memos_dir, read_timestamp("last_timestamp.txt")) == []
+    
+    def test_writes_finish_before_timestamp(self, memos, tmp_path, monkeypatch):
+        """Test that the timestamp is only saved once every transcript is written."""
+        memos_dir, _ = memos
+        written = []
+        saved_after = []
+        
+        def slow_write(directory, filename, content):
+            time.sleep(0.05)
+            written.append(filename)
+        
+        monkeypatch.setattr(process_voice_memos, "write_string_to_file", slow_write)
+        monkeypatch.setattr(
+            process_voice_memos, "write_timestamp",
+            lambda filepath, timestamp=None: saved_after.append(len(written))
+        )
+        
+        process_once(memos_dir, tmp_path / "out")
+        
+        assert saved_after == [3]
+    
+    def test_failed_memo_is_retried(self, memos, tmp_path, monkeypatch):
+        """Test that a memo that fails to decode is skipped now and picked up by the next run."""
+        memos_dir, memo_files = memos
+        
+        def load_audio(audio_file, pool):
+            if audio_file.name == "middle.qta":
+                return _completed(exception=Exception("Failed to decode audio file: corrupt"))
+            return _completed(audio_file.name)
+        
+        monkeypatch.setattr(process_voice_memos, "load_audio", load_audio)
+        
+        process_once(memos_dir, tmp_path / "out")
+        
+        assert len(list((tmp_path / "out").iterdir())) == 2
+        remaining = find_audio_files(memos_dir, read_timestamp("last_timestamp.txt"))
+        assert remaining == [memo_files[2], memo_files[1]]
+    
+    def test_transcription_error_keeps_timestamp(self, memos, tmp_path, monkeypatch):
+        """Test that a transcriber failure (e.g. model load) propagates and loses no memos."""
+        memos_dir, _ = memos
+        
+        def failing_transcribe_many(samples):
+            raise Exception("Failed to transcribe audio: model download failed")
+            yield
+        
+        monkeypatch.setattr(process_voice_memos, "transcribe_many", failing_transcribe_many)
+        
+        with pytest.raises(Exception, match="model download failed"):
+            process_once(memos_dir, tmp_path / "out")
+        
+        assert not (tmp_path / "last_timestamp.txt").exists()
+
+
+class TestDecodeAhead:
+    """Test cases for decode_ahead function."""
+    
+    def test_yields_in_input_order(self, monkeypatch):
+        """Test that decodes come back in input order."""
+        monkeypatch.setattr(
+            process_voice_memos, "load_audio", lambda audio_file, pool: _completed(audio_file.name)
+        )
+        audio_files = [Path(f"memo{i}.m4a") for i in range(5)]
+        
+        results = [future.result() for future in decode_ahead(audio_files, ahead=2)]
+        
+        assert results == [f"memo{i}.m4a" for i in range(5)]
+    
+    def test_early_stop_cancels_pending(self, monkeypatch):
+        """Test that decodes queued ahead are cancelled when the consumer stops."""
+        futures = []
+        
+        def load_audio(audio_file, pool):
+            futures.append(Future())
+            return futures[-1]
+        
+        monkeypatch.setattr(process_voice_memos, "load_audio", load_audio)
+        audio_files = [Path(f"memo{i}.m4a") for i in range(5)]
+        
+        decodes = decode_ahead(audio_files, ahead=2)
+        assert next(decodes) is futures[0]
+        decodes.close()
+        
+        # Only ahead + 1 files were ever queued, and the two not handed out are cancelled
+        assert len(futures) == 3
+        assert futures[1].cancelled()
+        assert futures[2].cancelled()